@@ -2,7 +2,14 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+import os
+import re
+from pathlib import Path
+from types import SimpleNamespace
 
 # Set Streamlit config at the top
 st.set_page_config(page_title="Interest Rates Risk Analysis", layout="wide")
@@ -10,21 +17,99 @@ st.set_page_config(page_title="Interest Rates Risk Analysis", layout="wide")
 # Load and enhance data with Risk Level
 @st.cache_data
 def load_data():
-    df = pd.read_csv('Interest_Rates.csv')
-
-    # Add Risk Level classification
-    def classify_risk(value):
-        if value < 10: return "Low"
-        elif value < 20: return "Medium"
-        else: return "High"
-
-    df['Risk Level'] = df['Value'].apply(classify_risk)
+    # Parse the CSV once and memory-map an uncompressed Arrow IPC copy on later cold starts
+    csv_path = Path('Interest_Rates.csv')
+    arrow_path = csv_path.with_suffix('.arrow')
+    df = None
+    if arrow_path.exists() and arrow_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        try:
+            df = feather.read_feather(arrow_path, memory_map=True)
+        except (pa.ArrowInvalid, OSError):
+            # Unreadable copy: fall through and rebuild it from the CSV
+            df = None
+
+    if df is None:
+        # Risk Level is recomputed below; Sector Type is optional (see the fallback below)
+        df = pd.read_csv(csv_path, engine='pyarrow').drop(columns='Risk Level', errors='ignore')
+        # Categories are stored as Arrow dictionary arrays and come back as categories
+        df['Description'] = df['Description'].astype('category')
+        if 'Sector Type' in df.columns:
+            df['Sector Type'] = df['Sector Type'].astype('category')
+
+        # Write to a private temp file and swap it in, so readers never see a partial copy
+        tmp_path = arrow_path.with_name(f"{arrow_path.name}.{os.getpid()}.tmp")
+        try:
+            feather.write_feather(df, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, arrow_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    # Add Risk Level classification: <10 Low, 10-20 Medium, >=20 High
+    df['Risk Level'] = pd.cut(
+        df['Value'].to_numpy(),
+        bins=[-np.inf, 10, 20, np.inf],
+        labels=["Low", "Medium", "High"],
+        right=False
+    )
 
     # Simulate sector type column (if it doesn't exist)
     if 'Sector Type' not in df.columns:
-        df['Sector Type'] = np.where(df['Description'].str.contains("TREASURY|BILL", case=False), "Public", "Private")
-
-    return df
+        # Match the handful of distinct rate names (the categories, NaN-free) rather than every row
+        public_descs = {d for d in df['Description'].cat.categories if re.search("TREASURY|BILL", d, re.IGNORECASE)}
+        df['Sector Type'] = np.where(df['Description'].isin(public_descs), "Public", "Private")
+
+    # Store the low-cardinality text columns as categories
+    df['Description'] = df['Description'].astype('category')
+    df['Sector Type'] = df['Sector Type'].astype('category')
+
+    # Keep rows in ascending Year order so year ranges map to contiguous slices
+    return df.sort_values('Year', kind='mergesort', ignore_index=True)
+
+# Colour used for each risk level across the charts
+RISK_COLORS = {"Low": "green", "Medium": "orange", "High": "red"}
+
+# Upper bound on points sent to the browser for each rate type
+MAX_POINTS_PER_TRACE = 2000
+
+# Largest-Triangle-Three-Buckets: pick n_out indices that preserve the shape of (x, y).
+# Loops in Python once per output bucket; the triangle areas within a bucket use NumPy.
+def lttb_indices(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        nxt_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:nxt_stop].mean()
+        avg_y = y[stop:nxt_stop].mean()
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:stop] - y[prev])
+            - (x[prev] - x[start:stop]) * (avg_y - y[prev])
+        )
+        prev = start + int(area.argmax())
+        keep[i + 1] = prev
+    return keep
+
+# Downsample each rate type's series to at most n_out points for plotting
+def downsample_by_rate(data, n_out=MAX_POINTS_PER_TRACE):
+    if len(data) <= n_out:
+        return data
+
+    keep = []
+    for _, group in data.groupby('Description', observed=True):
+        group = group.sort_values('Year', kind='mergesort')
+        idx = lttb_indices(
+            group['Year'].to_numpy(dtype=float),
+            group['Value'].to_numpy(dtype=float),
+            n_out
+        )
+        keep.append(group.index.to_numpy()[idx])
+    return data.loc[np.concatenate(keep)]
 
 # Initialize session state variables
 if 'df' not in st.session_state:
@@ -36,6 +121,17 @@ if 'page' not in st.session_state:
 
 df = st.session_state.df
 
+# Column metadata used by the filter widgets, computed once rather than per rerun
+@st.cache_data
+def get_axis_metadata():
+    return dict(
+        ymin=int(df['Year'].min()),
+        ymax=int(df['Year'].max()),
+        rate_types=df['Description'].unique().tolist()
+    )
+
+axis_meta = get_axis_metadata()
+
 # Title
 st.title("Interest Rates with Risk Level Classification")
 
@@ -50,7 +146,7 @@ if st.sidebar.button("Summary Statistics"):
 
 # Sidebar filters (always visible)
 st.sidebar.header("Filters")
-rate_types = df['Description'].unique()
+rate_types = axis_meta['rate_types']
 selected_rates = st.sidebar.multiselect(
     "Select rate types", 
     rate_types, 
@@ -65,20 +161,138 @@ risk_levels = st.sidebar.multiselect(
 
 year_range = st.sidebar.slider(
     "Select year range",
-    min_value=int(df['Year'].min()),
-    max_value=int(df['Year'].max()),
+    min_value=axis_meta['ymin'],
+    max_value=axis_meta['ymax'],
     value=(1990, 2008)
 )
 
+# Find the matching row positions once per unique widget state
+@st.cache_data
+def compute_filter_rows(selected_rates, risk_levels, y0, y1):
+    # df is sorted by Year, so the year range is a binary search rather than a scan
+    lo, hi = np.searchsorted(df['Year'].to_numpy(), [y0, y1 + 1])
+    base = df.iloc[lo:hi]
+    mask = np.logical_and(
+        base['Description'].isin(selected_rates).to_numpy(),
+        base['Risk Level'].isin(risk_levels).to_numpy()
+    )
+    return lo + np.flatnonzero(mask)
+
 # Apply filters
-filtered_df = df[
-    (df['Description'].isin(selected_rates)) & 
-    (df['Risk Level'].isin(risk_levels)) & 
-    (df['Year'] >= year_range[0]) & 
-    (df['Year'] <= year_range[1])
-]
+filter_key = (tuple(selected_rates), tuple(risk_levels), year_range[0], year_range[1])
+filtered_df = df.iloc[compute_filter_rows(*filter_key)]
 st.session_state.filtered_df = filtered_df
 
+# Aggregates of filtered_df, cached per filter state (filtered_df is fully determined by filter_key)
+@st.cache_data
+def derived(filter_key):
+    value_stats = filtered_df['Value'].agg(['mean', 'max', 'min', 'std'])
+    return SimpleNamespace(
+        unique_descs=filtered_df['Description'].unique().tolist(),
+        avg_rate=value_stats['mean'],
+        max_rate=value_stats['max'],
+        min_rate=value_stats['min'],
+        std_dev=value_stats['std']
+    )
+
+@st.cache_data
+def yearly_risk_counts(filter_key):
+    return filtered_df.groupby(['Year', 'Risk Level'], observed=True).size().unstack().fillna(0)
+
+@st.cache_data
+def risk_heatmap_matrix(filter_key):
+    return (
+        filtered_df.groupby(['Year', 'Risk Level'], observed=True)['Value']
+        .mean()
+        .unstack()
+        .astype('float32')
+    )
+
+@st.cache_data
+def group_stats(filter_key, by):
+    return filtered_df.groupby(by, observed=True)['Value'].agg(['mean', 'median', 'std', 'min', 'max'])
+
+# Per-rate sub-frames of filtered_df, so tabs look a rate up instead of re-scanning
+@st.cache_data
+def split_by_description(filter_key):
+    return dict(tuple(filtered_df.groupby('Description', observed=True)))
+
+# Bin edges and per-risk-level counts for one rate type, computed with NumPy
+def hist_counts(hist_data, bins):
+    values = hist_data['Value'].to_numpy()
+    risk = hist_data['Risk Level'].to_numpy()
+
+    edges = np.histogram_bin_edges(values, bins=bins)
+    counts = {
+        level: np.histogram(values[risk == level], bins=edges)[0]
+        for level in RISK_COLORS
+        if (risk == level).any()
+    }
+    return edges, counts
+
+# Histogram figure and statistics for one rate type; figures are kept as shared resources
+@st.cache_resource(max_entries=64)
+def build_histogram(rate, bins, filter_key):
+    hist_data = split_by_description(filter_key).get(rate)
+    if hist_data is None or hist_data.empty:
+        return None, None
+
+    hist_stats = hist_data['Value'].agg(['mean', 'median', 'std', 'min', 'max'])
+    edges, counts = hist_counts(hist_data, bins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    widths = np.diff(edges)
+    bin_ranges = np.column_stack([edges[:-1], edges[1:]])
+
+    # Rug strip on top, stacked bars from the precomputed counts below
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.03)
+    for level, level_counts in counts.items():
+        color = RISK_COLORS[level]
+        level_rows = hist_data[hist_data['Risk Level'] == level]
+        fig.add_trace(go.Bar(
+            x=centers,
+            y=level_counts,
+            width=widths,
+            name=level,
+            legendgroup=level,
+            marker=dict(color=color),
+            customdata=bin_ranges,
+            hovertemplate=(
+                "Interest Rate (%)=%{customdata[0]:.2f}-%{customdata[1]:.2f}"
+                "<br>count=%{y}<extra></extra>"
+            )
+        ), row=2, col=1)
+        fig.add_trace(go.Scatter(
+            x=level_rows['Value'].to_numpy(),
+            y=np.full(len(level_rows), level),
+            mode='markers',
+            marker=dict(symbol='line-ns-open', color=color),
+            customdata=level_rows['Year'].to_numpy(),
+            hovertemplate="Interest Rate (%)=%{x}<br>Year=%{customdata}<extra></extra>",
+            legendgroup=level,
+            showlegend=False
+        ), row=1, col=1)
+
+    fig.update_layout(
+        title=f"Distribution of {rate}",
+        barmode='stack',
+        bargap=0,
+        legend_title_text="Risk Level"
+    )
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    fig.update_xaxes(title_text="Interest Rate (%)", row=2, col=1)
+    fig.update_yaxes(title_text="count", row=2, col=1)
+
+    fig.add_vline(
+        x=hist_stats['mean'],
+        line_dash="dash",
+        line_color="black",
+        annotation_text=f"Mean: {hist_stats['mean']:.2f}%",
+        annotation_position="top",
+        row=2,
+        col=1
+    )
+    return fig, hist_stats
+
 # Page routing
 if st.session_state.page == "About":
     st.subheader("About this Dashboard")
@@ -118,15 +332,12 @@ elif st.session_state.page == "Dashboard":
     if not filtered_df.empty:
         col1, col2, col3, col4 = st.columns(4)
 
-        avg_rate = filtered_df['Value'].mean()
-        max_rate = filtered_df['Value'].max()
-        min_rate = filtered_df['Value'].min()
-        std_dev = filtered_df['Value'].std()
+        meta = derived(filter_key)
 
-        col1.metric("Average Interest Rate", f"{avg_rate:.2f}%")
-        col2.metric("Max Interest Rate", f"{max_rate:.2f}%")
-        col3.metric("Min Interest Rate", f"{min_rate:.2f}%")
-        col4.metric("Standard Deviation", f"{std_dev:.2f}")
+        col1.metric("Average Interest Rate", f"{meta.avg_rate:.2f}%")
+        col2.metric("Max Interest Rate", f"{meta.max_rate:.2f}%")
+        col3.metric("Min Interest Rate", f"{meta.min_rate:.2f}%")
+        col4.metric("Standard Deviation", f"{meta.std_dev:.2f}")
     else:
         st.warning("No data matches your filters")
 
@@ -135,15 +346,36 @@ elif st.session_state.page == "Dashboard":
     with tab1:
         st.subheader("Interest Rates by Risk Level")
         if not filtered_df.empty:
-            fig = px.scatter(
-                filtered_df,
-                x="Year",
-                y="Value",
-                color="Risk Level",
-                color_discrete_map={"Low": "green", "Medium": "orange", "High": "red"},
-                hover_data=["Description"],
+            plot_df = downsample_by_rate(filtered_df)
+            years = np.ascontiguousarray(plot_df['Year'].to_numpy())
+            values = np.ascontiguousarray(plot_df['Value'].to_numpy())
+            descs = plot_df['Description'].astype(str).to_numpy()
+            risk = plot_df['Risk Level'].cat
+            codes = risk.codes.to_numpy()
+
+            # One WebGL trace per risk level present, so legend clicks still hide a level
+            fig = go.Figure()
+            for code in np.unique(codes[codes >= 0]):
+                level = risk.categories[code]
+                rows = codes == code
+                fig.add_trace(go.Scattergl(
+                    x=years[rows],
+                    y=values[rows],
+                    mode='markers',
+                    name=level,
+                    marker=dict(color=RISK_COLORS[level]),
+                    customdata=descs[rows],
+                    hovertemplate=(
+                        f"Risk Level={level}<br>Year=%{{x}}<br>Interest Rate (%)=%{{y}}<br>"
+                        "Description=%{customdata}<extra></extra>"
+                    )
+                ))
+
+            fig.update_layout(
                 title="Rates Colored by Risk Level",
-                labels={"Value": "Interest Rate (%)"}
+                xaxis_title="Year",
+                yaxis_title="Interest Rate (%)",
+                legend_title_text="Risk Level"
             )
             st.plotly_chart(fig, use_container_width=True)
         else:
@@ -152,8 +384,12 @@ elif st.session_state.page == "Dashboard":
     with tab2:
         st.subheader("Risk Level Distribution")
         if not filtered_df.empty:
-            risk_counts = filtered_df['Risk Level'].value_counts().reset_index()
-            risk_counts.columns = ['Risk Level', 'Count']
+            # Count the integer category codes instead of hashing labels
+            risk = filtered_df['Risk Level'].cat
+            codes = risk.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(risk.categories))
+            risk_counts = pd.DataFrame({'Risk Level': risk.categories, 'Count': counts})
+            risk_counts = risk_counts[risk_counts['Count'] > 0]
 
             fig = px.pie(
                 risk_counts,
@@ -170,14 +406,26 @@ elif st.session_state.page == "Dashboard":
     with tab3:
         st.subheader("Risk Level Trends Over Time")
         if not filtered_df.empty:
-            yearly_risk = filtered_df.groupby(['Year', 'Risk Level']).size().unstack().fillna(0)
-
-            fig = px.area(
-                yearly_risk,
-                color_discrete_map={"Low": "green", "Medium": "orange", "High": "red"},
-                title="Count of Rates by Risk Level Each Year"
+            yearly_risk = yearly_risk_counts(filter_key)
+
+            years = np.ascontiguousarray(yearly_risk.index.to_numpy())
+
+            fig = go.Figure()
+            for level in yearly_risk.columns:
+                fig.add_trace(go.Scatter(
+                    x=years,
+                    y=np.ascontiguousarray(yearly_risk[level].to_numpy()),
+                    name=str(level),
+                    mode='lines',
+                    stackgroup='risk',
+                    line=dict(color=RISK_COLORS[level])
+                ))
+            fig.update_layout(
+                title="Count of Rates by Risk Level Each Year",
+                xaxis_title="Year",
+                yaxis_title="Count of Rates",
+                legend_title_text="Risk Level"
             )
-            fig.update_layout(yaxis_title="Count of Rates")
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.warning("No data matches your filters")
@@ -187,7 +435,7 @@ elif st.session_state.page == "Dashboard":
         if not filtered_df.empty:
             selected_rate = st.selectbox(
                 "Select rate type for histogram",
-                filtered_df['Description'].unique()
+                derived(filter_key).unique_descs
             )
             bins = st.slider(
                 "Number of bins",
@@ -196,39 +444,18 @@ elif st.session_state.page == "Dashboard":
                 value=15
             )
 
-            hist_data = filtered_df[filtered_df['Description'] == selected_rate]
-
-            if not hist_data.empty:
-                fig = px.histogram(
-                    hist_data,
-                    x="Value",
-                    nbins=bins,
-                    color="Risk Level",
-                    color_discrete_map={"Low": "green", "Medium": "orange", "High": "red"},
-                    title=f"Distribution of {selected_rate}",
-                    labels={"Value": "Interest Rate (%)"},
-                    marginal="rug",
-                    hover_data=["Year"]
-                )
-
-                mean_val = hist_data['Value'].mean()
-                fig.add_vline(
-                    x=mean_val,
-                    line_dash="dash",
-                    line_color="black",
-                    annotation_text=f"Mean: {mean_val:.2f}%",
-                    annotation_position="top"
-                )
+            fig, hist_stats = build_histogram(selected_rate, bins, filter_key)
 
+            if fig is not None:
                 st.plotly_chart(fig, use_container_width=True)
 
                 st.write(f"""
                 **Statistics for {selected_rate}**:
-                - Mean: {hist_data['Value'].mean():.2f}%
-                - Median: {hist_data['Value'].median():.2f}%
-                - Standard Deviation: {hist_data['Value'].std():.2f}%
-                - Minimum: {hist_data['Value'].min():.2f}%
-                - Maximum: {hist_data['Value'].max():.2f}%
+                - Mean: {hist_stats['mean']:.2f}%
+                - Median: {hist_stats['median']:.2f}%
+                - Standard Deviation: {hist_stats['std']:.2f}%
+                - Minimum: {hist_stats['min']:.2f}%
+                - Maximum: {hist_stats['max']:.2f}%
                 """)
             else:
                 st.warning(f"No data available for {selected_rate} with current filters")
@@ -238,12 +465,7 @@ elif st.session_state.page == "Dashboard":
     with tab5:
         st.subheader("Heatmap of Interest Rates by Year and Risk Level")
         if not filtered_df.empty:
-            heatmap_data = filtered_df.pivot_table(
-                index='Year',
-                columns='Risk Level',
-                values='Value',
-                aggfunc=np.mean
-            )
+            heatmap_data = risk_heatmap_matrix(filter_key)
 
             fig = go.Figure(data=go.Heatmap(
                 z=heatmap_data.values,
@@ -265,15 +487,15 @@ elif st.session_state.page == "Summary":
         st.write(filtered_df['Value'].describe().to_frame().T)
 
         st.write("### Statistics by Risk Level")
-        risk_stats = filtered_df.groupby('Risk Level')['Value'].agg(['mean', 'median', 'std', 'min', 'max'])
+        risk_stats = group_stats(filter_key, 'Risk Level')
         st.write(risk_stats)
 
         st.write("### Statistics by Rate Type")
-        rate_stats = filtered_df.groupby('Description')['Value'].agg(['mean', 'median', 'std', 'min', 'max'])
+        rate_stats = group_stats(filter_key, 'Description')
         st.write(rate_stats)
 
         st.write("### Yearly Statistics")
-        yearly_stats = filtered_df.groupby('Year')['Value'].agg(['mean', 'median', 'std', 'min', 'max'])
+        yearly_stats = group_stats(filter_key, 'Year')
         st.write(yearly_stats)
     else:
         st.warning("No data matches your filters")